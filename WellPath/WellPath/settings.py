@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 import dj_database_url 
 
@@ -26,7 +27,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 import os
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'dev-only-insecure-key-change-in-prod')
-DEBUG = bool(os.environ.get("DEBUG", default=0))
+DEBUG = os.environ.get("DEBUG", "0").lower() in ("1", "true")
 ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
 
 # Application definition
@@ -63,8 +64,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept in memory for the life of the worker.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -104,6 +111,9 @@ else:
             'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'wellpath_password'),
             'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
             'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # Reuse connections across requests, as in the DATABASE_URL branch
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 
@@ -127,6 +137,27 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# PBKDF2 is deliberately slow; `manage.py test` creates many users, so use
+# a fast hasher for test runs only.
+if 'test' in sys.argv:
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+
+# Cache
+# Category lists, unit lists and chart data are cached and cleared by
+# signals. gunicorn runs several workers (WEB_CONCURRENCY), and the
+# default local-memory cache is private to each one, so a clear in one
+# worker would never reach the others. In production use a file-based
+# cache that every worker on the instance shares.
+if not DEBUG and 'test' not in sys.argv:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', '/tmp/wellpath-cache'),
+        }
+    }
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -0,0 +1,25 @@
+"""
+Django settings for running the WellPath test suite.
+
+Usage:
+    python manage.py test --settings=WellPath.settings_test
+
+Runs the tests against an in-memory SQLite database, so creating the test
+database and applying migrations never touches the disk. When the suite
+has to run against Postgres instead, use the regular settings and pass
+``--keepdb`` so the test schema is reused between runs.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# PBKDF2 is deliberately slow; tests create many users, so use a fast hasher.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
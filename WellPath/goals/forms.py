@@ -43,8 +43,6 @@ class CustomUserCreationForm(UserCreationForm):
 
 
 class GoalForm(forms.ModelForm):
-    from taxonomy.models import Category, Unit
-
     title = forms.CharField(
         required=True,
         widget=forms.TextInput(attrs={
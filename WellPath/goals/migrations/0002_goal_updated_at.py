@@ -0,0 +1,18 @@
+# Generated by Django 5.2.14 on 2026-10-15 21:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.14 on 2026-10-15 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0002_goal_updated_at'),
+        ('taxonomy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'finished_at'], name='goal_user_finished_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progress',
+            index=models.Index(fields=['goal', 'date'], name='progress_goal_date_idx'),
+        ),
+    ]
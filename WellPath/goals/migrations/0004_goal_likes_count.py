@@ -0,0 +1,31 @@
+# Generated by Django 5.2.14 on 2026-10-15 22:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    Goal = apps.get_model('goals', 'Goal')
+    Like = apps.get_model('social', 'Like')
+    like_counts = Like.objects.filter(
+        goal=OuterRef('pk')
+    ).order_by().values('goal').annotate(total=Count('pk')).values('total')
+    Goal.objects.update(likes_count=Coalesce(Subquery(like_counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0003_goal_progress_indexes'),
+        ('social', '0002_delete_comment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.14 on 2026-10-15 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0004_goal_likes_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='goal',
+            name='likes_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+    ]
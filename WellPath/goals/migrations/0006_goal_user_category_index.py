@@ -0,0 +1,18 @@
+# Generated by Django 5.2.14 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0005_goal_likes_count_index'),
+        ('taxonomy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'category'], name='goal_user_category_idx'),
+        ),
+    ]
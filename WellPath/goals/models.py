@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Sum
 from django.core.exceptions import ValidationError
 from django.utils.timezone import now
 
@@ -30,6 +31,18 @@ class Goal(models.Model):
     is_public = models.BooleanField(default=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     finished_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Part of the cache key for rendered goal cards
+    updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized number of likes, kept in sync by social.signals
+    likes_count = models.PositiveIntegerField(default=0, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Dashboard and category stats split a user's goals by finished_at
+            models.Index(fields=['user', 'finished_at'], name='goal_user_finished_idx'),
+            # The category page lists one user's goals in one category
+            models.Index(fields=['user', 'category'], name='goal_user_category_idx'),
+        ]
 
     def __str__(self):
         return f"Goal: {self.title}, User: {self.user.username}"
@@ -44,17 +57,28 @@ class Goal(models.Model):
 
     def get_current_value(self):
         """Sum of all progress values for this goal."""
-        return sum(p.value for p in self.progresses.all())
+        # List services annotate the sum in SQL; use it when present
+        if getattr(self, 'current_value', None) is not None:
+            return self.current_value
+        # Reuse prefetched progresses, otherwise let the database add them up
+        if 'progresses' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum(p.value for p in self.progresses.all())
+        return self.progresses.aggregate(total=Sum('value'))['total'] or 0
 
     def has_today_progress(self, user):
         """Check if user has logged progress today."""
-        return self.progresses.filter(user=user, date=now().date()).first()
+        if not user.is_authenticated:
+            return None
+        today = now().date()
+        # goal_detail prefetches progresses; search them instead of querying
+        if 'progresses' in getattr(self, '_prefetched_objects_cache', {}):
+            return next(
+                (p for p in self.progresses.all() if p.user_id == user.pk and p.date == today),
+                None
+            )
+        return self.progresses.filter(user=user, date=today).first()
 
     # Social features (simple counts - these are fine in model)
-    @property
-    def likes_count(self):
-        return self.likes.count()
-
     @property
     def comments_count(self):
         return self.comments.count()
@@ -96,6 +120,10 @@ class Progress(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'goal', 'date'], name='unique_daily_progress')
         ]
+        indexes = [
+            # Per-goal history and sums; the unique constraint leads with user
+            models.Index(fields=['goal', 'date'], name='progress_goal_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.goal.title} - {self.value} on {self.date}"
@@ -3,13 +3,18 @@ Business logic for goals app.
 Following HackSoft Django Style Guide principles.
 """
 
+from django.core.cache import cache
+from django.db import transaction
 from django.utils.timezone import now
-from django.db.models import QuerySet, Sum, Case, When, F, Q, Value, CharField, Count
+from django.db.models import QuerySet, Sum, Case, When, F, Q, Value, CharField, Count, FloatField
+from django.db.models.functions import Coalesce
 from datetime import timedelta, date
+from itertools import accumulate
 from typing import Dict, List, Optional, Tuple
 
 from .models import Goal, Progress, ProgressPhoto, User
 from taxonomy.models import Category
+from taxonomy.services import category_list
 
 
 # =============================================================================
@@ -76,6 +81,7 @@ def goal_progress_percentage(goal: Goal) -> float:
 # PROGRESS MANAGEMENT
 # =============================================================================
 
+@transaction.atomic
 def progress_create_or_update(
     *,
     user: User,
@@ -83,10 +89,9 @@ def progress_create_or_update(
     value: float,
     date: Optional[date] = None,
     images: Optional[List] = None
-) -> Tuple[Progress, bool]:
+) -> Progress:
     """
     Create or update daily progress for a goal.
-    Returns (progress, created) tuple.
     
     Args:
         user: The user adding progress
@@ -96,36 +101,76 @@ def progress_create_or_update(
         images: List of image files to attach
     
     Returns:
-        Tuple of (Progress instance, bool indicating if newly created)
+        The saved Progress instance
     """
     if date is None:
         date = now().date()
     
-    progress, created = Progress.objects.get_or_create(
-        user=user,
-        goal=goal,
-        date=date,
-        defaults={"value": value}
-    )
-    
-    if not created:
-        progress.value = value
-        progress.save()
+    # A single INSERT ... ON CONFLICT DO UPDATE instead of
+    # get_or_create() followed by save()
+    [progress] = progress_bulk_upsert(user=user, goal=goal, entries=[(date, value)])
     
     # Handle image uploads
+    # Each file is written to storage as its row is prepared, then all
+    # photo rows go in with a single INSERT instead of one per image.
     if images:
-        for img in images:
-            ProgressPhoto.objects.create(progress=progress, image=img)
+        ProgressPhoto.objects.bulk_create(
+            [ProgressPhoto(progress=progress, image=img) for img in images]
+        )
     
-    return progress, created
+    return progress
 
 
-def progress_check_goal_completion(goal: Goal) -> bool:
+@transaction.atomic
+def progress_bulk_upsert(
+    *,
+    user: User,
+    goal: Goal,
+    entries: List[Tuple[date, float]]
+) -> List[Progress]:
+    """
+    Create or update progress for several days of one goal at once.
+    Used for backfilling missed days.
+    
+    Args:
+        user: The user adding progress
+        goal: The goal to track progress for
+        entries: (date, value) pairs; a later pair wins if a date repeats
+    
+    Returns:
+        List of Progress instances
+    """
+    # One row per date: Postgres refuses to upsert the same row twice
+    # in a single statement
+    values_by_date = dict(entries)
+    
+    # A single INSERT ... ON CONFLICT DO UPDATE instead of a
+    # get_or_create() + save() per day
+    progresses = Progress.objects.bulk_create(
+        [Progress(user=user, goal=goal, date=d, value=v) for d, v in values_by_date.items()],
+        update_conflicts=True,
+        unique_fields=['user', 'goal', 'date'],
+        update_fields=['value'],
+    )
+    
+    # bulk_create() skips post_save, so the signal handler never runs
+    goal_chart_cache_invalidate(goal_id=goal.pk)
+    
+    return progresses
+
+
+def progress_check_goal_completion(goal: Goal, *, current_value: Optional[float] = None) -> bool:
     """
     Check if goal just got completed and update finished_at timestamp.
     Returns True if goal was just marked as completed.
+    
+    Pass current_value when the caller already has the total, to skip
+    summing the progress again.
     """
-    if goal_is_completed(goal) and goal.finished_at is None:
+    if current_value is None:
+        current_value = goal.get_current_value()
+    
+    if current_value >= goal.target_value and goal.finished_at is None:
         goal.finished_at = now()
         goal.save(update_fields=['finished_at'])
         return True
@@ -136,32 +181,35 @@ def progress_check_goal_completion(goal: Goal) -> bool:
 # GOAL QUERIES & FILTERING (OPTIMIZED WITH ANNOTATE)
 # =============================================================================
 
-def goal_list_for_user(
+def goal_queryset_for_user(
     *,
     user: User,
-    status_filter: Optional[str] = None
-) -> List[Goal]:
+    status_filter: Optional[str] = None,
+    category: Optional[Category] = None
+) -> QuerySet:
     """
-    Get all goals for a user, optionally filtered by status.
-    Uses database aggregation for performance.
+    Goals of a user as a lazy QuerySet, optionally filtered by status
+    and category. Status is computed and filtered in the database.
     
     Args:
         user: User to get goals for
         status_filter: Optional filter - 'active', 'completed', or 'overdue'
+        category: Optional category to restrict the goals to
     
     Returns:
-        List of Goal objects with annotated current_value and status
+        QuerySet of Goal objects with annotated current_value and status
     """
+    goals = Goal.objects.filter(user=user)
+    if category is not None:
+        goals = goals.filter(category=category)
+    
     # ✅ Calculate current_value for ALL goals in ONE query
-    goals = Goal.objects.filter(
-        user=user
-    ).select_related(
-        'unit', 'category'
-    ).prefetch_related(
-        'progresses'
+    goals = goals.select_related(
+        'user', 'unit', 'category'
     ).annotate(
         # This calculates the sum in the database!
-        current_value=Sum('progresses__value'),
+        # Coalesce keeps it non-null so the cards never re-sum in Python
+        current_value=Coalesce(Sum('progresses__value'), Value(0.0), output_field=FloatField()),
         # This calculates status in the database!
         db_status=Case(
             When(current_value__gte=F('target_value'), then=Value('completed')),
@@ -182,23 +230,43 @@ def goal_list_for_user(
     elif status_filter == "active":
         goals = goals.filter(db_status='active')
     
-    return list(goals)
+    return goals
 
 
-def goal_list_public(*, status_filter: str = "active") -> List[Goal]:
+def goal_list_for_user(
+    *,
+    user: User,
+    status_filter: Optional[str] = None
+) -> List[Goal]:
     """
-    Get public goals for feed, filtered by status.
+    Get all goals for a user, optionally filtered by status.
     Uses database aggregation for performance.
+    
+    Args:
+        user: User to get goals for
+        status_filter: Optional filter - 'active', 'completed', or 'overdue'
+    
+    Returns:
+        List of Goal objects with annotated current_value and status
+    """
+    return list(goal_queryset_for_user(user=user, status_filter=status_filter))
+
+
+def goal_public_queryset(*, status_filter: str = "active") -> QuerySet:
+    """
+    Public goals for the feed as a lazy, ordered QuerySet.
+    Uses database aggregation for performance; paginate it rather than
+    loading every public goal at once.
     """
     # Calculate in database
     goals = Goal.objects.filter(
         is_public=True
     ).select_related(
         'user', 'category', 'unit',
-    ).prefetch_related(
-        'likes', 'progresses'
     ).annotate(
-        current_value=Sum('progresses__value'),
+        # Goals without progress get 0 instead of NULL, so the cards never
+        # fall back to summing progresses in Python
+        current_value=Coalesce(Sum('progresses__value'), Value(0.0), output_field=FloatField()),
         db_status=Case(
             When(current_value__gte=F('target_value'), then=Value('completed')),
             When(
@@ -218,46 +286,72 @@ def goal_list_public(*, status_filter: str = "active") -> List[Goal]:
     elif status_filter == "overdue":
         goals = goals.filter(db_status='overdue')
     
-    return list(goals)
+    return goals.order_by('-created_at')
+
+
+def goal_list_public(*, status_filter: str = "active") -> List[Goal]:
+    """
+    Get public goals for feed, filtered by status.
+    Uses database aggregation for performance.
+    """
+    return list(goal_public_queryset(status_filter=status_filter))
 
 
 # =============================================================================
 # DASHBOARD STATISTICS (OPTIMIZED)
 # =============================================================================
 
+def category_list_with_active_counts(*, user: User) -> List[Category]:
+    """
+    All categories in display order, each annotated with
+    active_goals_count: how many of the user's goals in it are active.
+    
+    "Active" uses the same db_status annotation as the goal lists, so the
+    nav badge always matches the goals shown on the category page.
+    """
+    # Count in the database: one row per category, not one per goal
+    active_goals = goal_queryset_for_user(user=user, status_filter="active").values('pk')
+    active_counts = dict(
+        Goal.objects.filter(pk__in=active_goals)
+        .values('category_id')
+        .annotate(count=Count('id'))
+        .values_list('category_id', 'count')
+        .order_by()
+    )
+    
+    categories = category_list()
+    for category in categories:
+        category.active_goals_count = active_counts.get(category.id, 0)
+    return categories
+
+
 def dashboard_get_category_stats(user: User) -> Dict[int, Dict]:
     """
     Calculate statistics for each category for a user's dashboard.
     Uses database aggregation - NO Python loops!
     
     Returns:
-        Dict mapping category_id to stats dict with keys:
+        Dict mapping category_id (only categories the user has goals in)
+        to stats dict with keys:
         - category: Category object
         - active: count of active goals
         - completed: count of completed goals
         - total: total goals in category
     """
     # Calculate everything in the database!
-    categories = Category.objects.annotate(
+    # Filtering on goals__user first makes the counts reuse that join, so
+    # only this user's goals are grouped (no DISTINCT needed) and
+    # categories they have no goals in are skipped.
+    categories = Category.objects.filter(
+        goals__user=user
+    ).annotate(
         # Count total goals for this user in this category
-        total_goals=Count(
-            'goals',
-            filter=Q(goals__user=user),
-            distinct=True
-        ),
+        total_goals=Count('goals'),
         # Count completed goals (finished_at is set)
-        completed_goals=Count(
-            'goals',
-            filter=Q(goals__user=user, goals__finished_at__isnull=False),
-            distinct=True
-        ),
+        completed_goals=Count('goals', filter=Q(goals__finished_at__isnull=False)),
         # Count active goals (finished_at is null)
-        active_goals=Count(
-            'goals',
-            filter=Q(goals__user=user, goals__finished_at__isnull=True),
-            distinct=True
-        )
-    )
+        active_goals=Count('goals', filter=Q(goals__finished_at__isnull=True)),
+    ).order_by('order')
     
     # Convert to dict format
     category_stats = {}
@@ -285,18 +379,20 @@ def goal_get_chart_data(goal: Goal) -> Dict:
     - 60-365 days: Group by weeks
     - More than 365 days: Group by months
     
-    This is for a SINGLE goal, so it's OK to use get_current_value().
+    This is for a SINGLE goal. Prefetch 'progresses' to avoid extra queries.
     """
-    progress_history = goal.progresses.order_by("date")
+    # Sort in Python so a prefetched progresses cache (goal_detail) is reused
+    # instead of issuing new queries
+    progress_history = sorted(goal.progresses.all(), key=lambda p: p.date)
     
     # Determine date range
-    if progress_history.exists():
-        start_date = progress_history.first().date
+    if progress_history:
+        start_date = progress_history[0].date
     else:
         start_date = goal.created_at.date()
     
-    end_date = goal.deadline or now().date()
     today = now().date()
+    end_date = goal.deadline or today
     
     # Calculate timespan to determine grouping strategy
     total_days = (end_date - start_date).days + 1
@@ -318,7 +414,7 @@ def goal_get_chart_data(goal: Goal) -> Dict:
     last_date = min(today, end_date)
     days_passed = (last_date - start_date).days + 1 if last_date >= start_date else 1
     
-    total_progress = goal.get_current_value()
+    total_progress = sum(p.value for p in progress_history)
     avg_per_day = total_progress / days_passed if days_passed > 0 else 0
     
     # Calculate needed per day
@@ -344,33 +440,58 @@ def goal_get_chart_data(goal: Goal) -> Dict:
     return chart_data
 
 
+# Progress changes clear the entry (see signals.py) once they commit; the
+# production cache is shared by all workers, so every worker sees that.
+CHART_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _chart_cache_key(goal_id: int) -> str:
+    return f"goals:chart:{goal_id}"
+
+
+def goal_get_chart_data_cached(goal: Goal) -> Dict:
+    """
+    Cached goal_get_chart_data() for the goal detail page.
+    The entry is tied to today's date and the goal's updated_at, so it
+    expires at midnight and when the goal is edited; progress changes
+    drop it through the signals.
+    """
+    key = _chart_cache_key(goal.pk)
+    version = (now().date(), goal.updated_at)
+    
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    chart_data = goal_get_chart_data(goal)
+    cache.set(key, (version, chart_data), CHART_CACHE_TIMEOUT)
+    return chart_data
+
+
+def goal_chart_cache_invalidate(*, goal_id: int) -> None:
+    """
+    Drop the cached chart data for a goal once the current transaction
+    commits, so a concurrent read can't cache the old data again.
+    """
+    key = _chart_cache_key(goal_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
 def _generate_daily_chart_data(start_date: date, end_date: date, today: date, 
                                 progress_map: Dict[date, float], goal: Goal) -> Dict:
     """Generate daily chart data for goals under 60 days."""
-    all_dates = []
-    current = start_date
-    while current <= end_date:
-        all_dates.append(current)
-        current += timedelta(days=1)
+    all_dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
     
-    cumulative = []
-    values = []
-    running_total = 0.0
-    
-    for d in all_dates:
-        if d <= today:
-            v = float(progress_map.get(d, 0))
-            values.append(v)
-            running_total += v
-            cumulative.append(running_total)
-        else:
-            values.append(None)
-            cumulative.append(None)
+    # Dates are in order, so the days up to today are a prefix; the rest
+    # are future gaps in the chart
+    values = [float(progress_map.get(d, 0)) for d in all_dates if d <= today]
+    cumulative = list(accumulate(values))
+    future = [None] * (len(all_dates) - len(values))
     
     return {
         "dates": [d.strftime("%Y-%m-%d") for d in all_dates],
-        "values": values,
-        "cumulative": cumulative,
+        "values": values + future,
+        "cumulative": cumulative + future,
         "grouping": "daily"
     }
 
@@ -0,0 +1,16 @@
+"""
+Keep the cached goal chart data (see services.goal_get_chart_data_cached)
+in sync with progress changes.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Progress
+from .services import goal_chart_cache_invalidate
+
+
+@receiver(post_save, sender=Progress)
+@receiver(post_delete, sender=Progress)
+def progress_changed(sender, instance, **kwargs):
+    goal_chart_cache_invalidate(goal_id=instance.goal_id)
@@ -35,6 +35,10 @@ document.addEventListener('DOMContentLoaded', function () {
           form.addEventListener('click', function(event) {
             event.stopPropagation();
           });
+          form.addEventListener('submit', function(event) {
+            event.preventDefault();
+            submit_progress(form, filter);
+          });
         });
       })
       .catch((error) => {
@@ -55,6 +59,37 @@ document.addEventListener('DOMContentLoaded', function () {
       });
   }
 
+  // Save progress over AJAX and reload the current tab in place
+  function submit_progress(form, filter) {
+    fetch(form.action, {
+      method: 'POST',
+      body: new FormData(form),
+      headers: { 'Accept': 'application/json' },
+      credentials: 'same-origin'
+    })
+      .then(r => r.json())
+      .then(data => {
+        if (!data.ok) {
+          notify(data.error || 'Failed to save progress', 'error');
+          return;
+        }
+        notify(
+          data.just_completed ? "Congratulations! You've achieved your goal." : 'Progress saved successfully!',
+          'success'
+        );
+        load_dashboard(filter);
+      })
+      .catch(() => notify('Network error', 'error'));
+  }
+
+  function notify(message, type) {
+    if (window.modernUI) {
+      window.modernUI.showNotification(message, type);
+    } else if (type === 'error') {
+      alert(message);
+    }
+  }
+
   // Make retry function globally accessible
   window.dashboardRetry = load_dashboard;
 
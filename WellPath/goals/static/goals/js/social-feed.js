@@ -10,15 +10,24 @@ class SocialFeed {
 
   init() {
     this.setupLikeButtons();
+    this.setupInfiniteScroll();
   }
 
   // Setup like button functionality
+  // Delegated from the document so cards added by infinite scroll work too
   setupLikeButtons() {
-    document.querySelectorAll('.like-btn').forEach(button => {
-      button.addEventListener('click', (e) => {
-        e.preventDefault();
-        this.handleLike(button);
-      });
+    document.addEventListener('click', (e) => {
+      const button = e.target.closest('.like-btn');
+      if (!button) return;
+      e.preventDefault();
+      this.handleLike(button);
+    });
+  }
+
+  // Render icons on cards loaded by htmx
+  setupInfiniteScroll() {
+    document.body.addEventListener('htmx:afterSwap', () => {
+      if (window.lucide) lucide.createIcons();
     });
   }
 
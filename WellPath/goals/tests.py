@@ -17,7 +17,8 @@ that users can reliably create goals, track progress, and manage their data
 without encountering bugs or data loss.
 """
 
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.utils.timezone import now
@@ -33,6 +34,7 @@ from .services import (
 )
 from .forms import CustomUserCreationForm, GoalForm, GoalEditForm
 from taxonomy.models import Category, Unit
+from taxonomy.services import category_list
 
 # Get the User model
 User = get_user_model()
@@ -212,22 +214,43 @@ class GoalModelTest(TestCase):
         # Now there should be progress today
         self.assertTrue(self.goal.has_today_progress(self.user))
     
+    def test_has_today_progress_uses_prefetch(self):
+        """
+        Test that has_today_progress() reads prefetched progress without querying.
+        """
+        Progress.objects.create(user=self.user, goal=self.goal, value=5.0)
+        goal = Goal.objects.prefetch_related('progresses').get(id=self.goal.id)
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(goal.has_today_progress(self.user).value, 5.0)
+    
     def test_likes_count(self):
         """
-        Test the likes_count property.
+        Test the likes_count field.
+        
+        The count is stored on the goal and updated by the like view, so
+        pages can show it without counting Like rows.
         """
-        from social.models import Like
+        like_url = reverse('like_goal', kwargs={'goal_id': self.goal.id})
         
         # Initially, no likes
         self.assertEqual(self.goal.likes_count, 0)
         
-        # Add some likes
+        # Two users like the goal
         user2 = User.objects.create_user(username='user2', password='pass')
-        Like.objects.create(user=self.user, goal=self.goal)
-        Like.objects.create(user=user2, goal=self.goal)
+        self.client.force_login(self.user)
+        self.client.post(like_url)
+        self.client.force_login(user2)
+        self.client.post(like_url)
         
         # Should have 2 likes
+        self.goal.refresh_from_db()
         self.assertEqual(self.goal.likes_count, 2)
+        
+        # Unliking brings the count back down
+        self.client.post(like_url)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.likes_count, 1)
     
     def test_is_liked_by(self):
         """
@@ -560,14 +583,15 @@ class GoalServiceTest(TestCase):
         """
         Test progress_create_or_update() creates new progress.
         """
-        progress, created = progress_create_or_update(
+        progress = progress_create_or_update(
             user=self.user,
             goal=self.goal,
             value=10.0
         )
         
-        self.assertTrue(created)
+        self.assertIsNotNone(progress.pk)
         self.assertEqual(progress.value, 10.0)
+        self.assertEqual(Progress.objects.get(pk=progress.pk).value, 10.0)
     
     def test_progress_create_or_update_updates(self):
         """
@@ -577,17 +601,36 @@ class GoalServiceTest(TestCase):
         progress_create_or_update(user=self.user, goal=self.goal, value=10.0)
         
         # Update it with a new value
-        progress, created = progress_create_or_update(
+        progress = progress_create_or_update(
             user=self.user,
             goal=self.goal,
             value=20.0
         )
         
-        self.assertFalse(created)
-        self.assertEqual(progress.value, 20.0)
+        self.assertEqual(Progress.objects.get(pk=progress.pk).value, 20.0)
         # Should still be only one progress entry
         self.assertEqual(Progress.objects.filter(goal=self.goal).count(), 1)
     
+    def test_progress_create_or_update_with_images(self):
+        """
+        Test progress_create_or_update() attaches every uploaded image.
+        """
+        images = [
+            SimpleUploadedFile(name=f'photo{i}.jpg', content=b'fake image content', content_type='image/jpeg')
+            for i in range(2)
+        ]
+        
+        progress = progress_create_or_update(
+            user=self.user,
+            goal=self.goal,
+            value=10.0,
+            images=images
+        )
+        
+        self.assertEqual(progress.photos.count(), 2)
+        for photo in progress.photos.all():
+            self.assertTrue(photo.image.name.startswith('progress_photos/'))
+    
     def test_progress_check_goal_completion(self):
         """
         Test progress_check_goal_completion() marks goal as finished.
@@ -696,6 +739,21 @@ class GoalServiceTest(TestCase):
         fitness_stats = stats[self.category.id]
         self.assertEqual(fitness_stats['total'], 1)
         self.assertEqual(fitness_stats['active'], 1)
+    
+    def test_dashboard_get_category_stats_ignores_other_users(self):
+        """
+        Test that other users' goals are not counted in the stats.
+        """
+        other_user = User.objects.create_user(username='otheruser', password='pass')
+        cat2 = Category.objects.create(cat="Nutrition", order=2)
+        Goal.objects.create(user=other_user, title="Other", category=self.category, target_value=10.0)
+        Goal.objects.create(user=other_user, title="Other 2", category=cat2, target_value=10.0)
+        
+        stats = dashboard_get_category_stats(user=self.user)
+        
+        self.assertEqual(stats[self.category.id]['total'], 1)
+        # The user has no goals in this category, so it is left out
+        self.assertNotIn(cat2.id, stats)
 
 
 # =============================================================================
@@ -929,6 +987,67 @@ class ChartDataGroupingTest(TestCase):
         self.category = Category.objects.create(cat="Test Category", slug="test")
         self.unit = Unit.objects.create(name="km", order=1)
         self.unit.categories.add(self.category)
+        
+        # Chart data is cached per goal; start every test empty
+        cache.clear()
+    
+    def test_cached_chart_data_refreshed_on_progress(self):
+        """Test that the cached chart data is dropped when progress changes."""
+        from .services import goal_get_chart_data_cached
+        
+        goal = Goal.objects.create(
+            user=self.user,
+            title="Short Goal",
+            unit=self.unit,
+            target_value=100,
+            deadline=date.today() + timedelta(days=30)
+        )
+        self.assertEqual(goal_get_chart_data_cached(goal)["cumulative"][0], 0.0)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            progress = Progress.objects.create(user=self.user, goal=goal, value=10)
+        self.assertEqual(goal_get_chart_data_cached(goal)["cumulative"][0], 10.0)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            progress.delete()
+        self.assertEqual(goal_get_chart_data_cached(goal)["cumulative"][0], 0.0)
+    
+    def test_cached_chart_data_skips_progress_query(self):
+        """Test that a cache hit doesn't load the progress entries at all."""
+        from .services import goal_get_chart_data_cached
+        
+        goal = Goal.objects.create(user=self.user, title="Short Goal", target_value=100)
+        Progress.objects.create(user=self.user, goal=goal, value=10)
+        goal_get_chart_data_cached(goal)
+        
+        with self.assertNumQueries(0):
+            chart_data = goal_get_chart_data_cached(goal)
+        self.assertEqual(chart_data["cumulative"][0], 10.0)
+    
+    def test_cached_chart_data_refreshed_on_goal_edit(self):
+        """Test that editing the goal (a new updated_at) rebuilds the chart."""
+        from .services import goal_get_chart_data_cached
+        
+        goal = Goal.objects.create(user=self.user, title="Short Goal", target_value=100)
+        before = goal_get_chart_data_cached(goal)["needed_per_day"]
+        
+        goal.target_value = 200
+        goal.save()
+        self.assertNotEqual(goal_get_chart_data_cached(goal)["needed_per_day"], before)
+    
+    def test_chart_cache_cleared_after_commit(self):
+        """Test that the cached chart data is only dropped once the write commits."""
+        from .services import _chart_cache_key, goal_get_chart_data_cached
+        
+        goal = Goal.objects.create(user=self.user, title="Short Goal", target_value=100)
+        goal_get_chart_data_cached(goal)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Progress.objects.create(user=self.user, goal=goal, value=10)
+            # Still cached until the transaction commits
+            self.assertIsNotNone(cache.get(_chart_cache_key(goal.pk)))
+        
+        self.assertIsNone(cache.get(_chart_cache_key(goal.pk)))
     
     def test_daily_grouping_for_short_goals(self):
         """Test that goals under 60 days use daily grouping."""
@@ -1030,3 +1149,376 @@ class ChartDataGroupingTest(TestCase):
         
         # The last non-null cumulative value should equal total progress
         self.assertEqual(max(non_null_cumulative), 23.0)
+
+
+# =============================================================================
+# VIEW TESTS
+# =============================================================================
+
+class LoginViewTest(TestCase):
+    """
+    Test the login view.
+    
+    The view validates credentials with Django's AuthenticationForm and
+    renders errors on the same request instead of redirecting back.
+    """
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+    
+    def test_login_success_redirects(self):
+        """Test that valid credentials log the user in and redirect."""
+        response = self.client.post(reverse('login'), {
+            'username': 'testuser',
+            'password': 'testpass123'
+        })
+        
+        self.assertRedirects(response, reverse('index'))
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.id)
+    
+    def test_login_failure_renders_inline(self):
+        """Test that invalid credentials re-render the form without a redirect."""
+        response = self.client.post(reverse('login'), {
+            'username': 'testuser',
+            'password': 'wrongpass'
+        })
+        
+        # Should render the login page directly (no redirect round-trip)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'goals/login.html')
+        self.assertTrue(response.context['form'].errors)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+
+class AddProgressViewTest(TestCase):
+    """
+    Test the add_progress view.
+    
+    Regular form posts redirect back to the goal page. AJAX clients that
+    send "Accept: application/json" get a JSON body instead.
+    """
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.category = Category.objects.create(cat="Fitness", order=1)
+        self.unit = Unit.objects.create(name="km", order=1)
+        self.goal = Goal.objects.create(
+            user=self.user,
+            title="Run 100km",
+            category=self.category,
+            unit=self.unit,
+            target_value=100.0,
+            deadline=date.today() + timedelta(days=30)
+        )
+        self.client.force_login(self.user)
+    
+    def test_add_progress_redirects(self):
+        """Test that a normal form post redirects to the goal page."""
+        response = self.client.post(reverse('add_progress'), {
+            'goal_id': self.goal.id,
+            'progress': '10'
+        })
+        
+        self.assertRedirects(response, reverse('goal_detail', kwargs={'goal_id': self.goal.id}))
+        self.assertEqual(self.goal.get_current_value(), 10.0)
+    
+    def test_add_progress_json(self):
+        """Test that AJAX clients get the new total back as JSON."""
+        response = self.client.post(
+            reverse('add_progress'),
+            {'goal_id': self.goal.id, 'progress': '100'},
+            HTTP_ACCEPT='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['ok'])
+        self.assertEqual(data['current_total'], 100.0)
+        self.assertTrue(data['completed'])
+    
+    def test_add_progress_other_users_goal(self):
+        """Test that progress cannot be added to someone else's goal."""
+        other_user = User.objects.create_user(username='otheruser', password='testpass123')
+        self.client.force_login(other_user)
+        
+        response = self.client.post(reverse('add_progress'), {
+            'goal_id': self.goal.id,
+            'progress': '10'
+        })
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Progress.objects.filter(goal=self.goal).exists())
+    
+    def test_add_progress_json_invalid_value(self):
+        """Test that an invalid value returns a 400 JSON error."""
+        response = self.client.post(
+            reverse('add_progress'),
+            {'goal_id': self.goal.id, 'progress': '-5'},
+            HTTP_ACCEPT='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['ok'])
+    
+    def test_add_progress_invalid_goal_id(self):
+        """Test that a non-numeric goal_id is a 400, not a server error."""
+        response = self.client.post(
+            reverse('add_progress'),
+            {'goal_id': 'abc', 'progress': '10'},
+            HTTP_ACCEPT='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['ok'])
+        
+        # An invalid value as well used to redirect to a URL that can't be built
+        response = self.client.post(reverse('add_progress'), {'goal_id': 'abc', 'progress': 'x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Progress.objects.filter(goal=self.goal).exists())
+    
+    def test_add_progress_batch(self):
+        """Test backfilling several days, including overwriting an existing day."""
+        yesterday = date.today() - timedelta(days=1)
+        Progress.objects.create(user=self.user, goal=self.goal, value=1.0, date=yesterday)
+        
+        response = self.client.post(
+            reverse('add_progress_batch'),
+            {
+                'goal_id': self.goal.id,
+                'date': [str(yesterday - timedelta(days=1)), str(yesterday)],
+                'progress': ['5', '7'],
+            },
+            HTTP_ACCEPT='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['current_total'], 12.0)
+        # Yesterday's entry was updated, not duplicated
+        self.assertEqual(Progress.objects.get(goal=self.goal, date=yesterday).value, 7.0)
+        self.assertEqual(Progress.objects.filter(goal=self.goal).count(), 2)
+    
+    def test_add_progress_batch_rejects_future_dates(self):
+        """Test that a batch with a future date is rejected as a whole."""
+        response = self.client.post(
+            reverse('add_progress_batch'),
+            {
+                'goal_id': self.goal.id,
+                'date': [str(date.today()), str(date.today() + timedelta(days=1))],
+                'progress': ['5', '5'],
+            },
+            HTTP_ACCEPT='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Progress.objects.filter(goal=self.goal).exists())
+    
+    def test_add_progress_batch_invalid_goal_id(self):
+        """Test that a non-numeric goal_id is a 400, not a server error."""
+        data = {'goal_id': 'abc', 'date': [str(date.today())], 'progress': ['5']}
+        
+        response = self.client.post(reverse('add_progress_batch'), data, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['ok'])
+        
+        del data['goal_id']
+        response = self.client.post(reverse('add_progress_batch'), data)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Progress.objects.filter(goal=self.goal).exists())
+
+
+class GoalDeleteViewTest(TestCase):
+    """
+    Test the delete_goal view.
+    
+    Only the owner of a goal can delete it.
+    """
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other_user = User.objects.create_user(username='otheruser', password='testpass123')
+        self.goal = Goal.objects.create(
+            user=self.user,
+            title="Run 100km",
+            target_value=100.0
+        )
+    
+    def test_delete_goal(self):
+        """Test that the owner can delete their goal."""
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('delete_goal', kwargs={'goal_id': self.goal.id}))
+        
+        self.assertRedirects(response, reverse('dashboard', kwargs={'username': 'testuser'}))
+        # EXISTS stops at the first row, COUNT(*) has to visit them all
+        self.assertFalse(Goal.objects.filter(id=self.goal.id).exists())
+    
+    def test_delete_goal_other_user(self):
+        """Test that another user cannot delete the goal."""
+        self.client.force_login(self.other_user)
+        response = self.client.post(reverse('delete_goal', kwargs={'goal_id': self.goal.id}))
+        
+        # Other users' goals are not found at all
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Goal.objects.filter(id=self.goal.id).exists())
+
+
+class FeedViewTest(TestCase):
+    """
+    Test the public feed view.
+    
+    The feed is paginated. Later pages are fetched by htmx when the user
+    scrolls, and those requests only get the goal cards back.
+    """
+    
+    def setUp(self):
+        """Create one more public goal than fits on a page."""
+        from .views import FEED_PAGE_SIZE
+        
+        self.page_size = FEED_PAGE_SIZE
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        Goal.objects.bulk_create([
+            Goal(user=self.user, title=f"Goal {i}", target_value=100.0)
+            for i in range(self.page_size + 1)
+        ])
+    
+    def test_feed_first_page(self):
+        """Test that the first page is limited to the page size."""
+        response = self.client.get(reverse('feed'))
+        
+        self.assertEqual(len(response.context['goals']), self.page_size)
+        self.assertTrue(response.context['page_obj'].has_next())
+        self.assertTemplateUsed(response, 'goals/feed.html')
+    
+    def test_feed_htmx_next_page(self):
+        """Test that htmx requests get only the cards for the next page."""
+        response = self.client.get(reverse('feed'), {'page': 2}, HTTP_HX_REQUEST='true')
+        
+        self.assertEqual(len(response.context['goals']), 1)
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertTemplateUsed(response, 'goals/_feed_card.html')
+        self.assertTemplateNotUsed(response, 'goals/feed.html')
+    
+    def test_feed_huge_page_number(self):
+        """Test that a page number too large for an SQL OFFSET gives an empty page."""
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('feed'), {'page': '9' * 30}, HTTP_HX_REQUEST='true')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['goals']), 0)
+        self.assertFalse(response.context['page_obj'].has_next())
+
+
+class GoalsApiViewTest(TestCase):
+    """
+    Test the goals_api view, which renders the dashboard goal cards.
+    """
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.goal = Goal.objects.create(
+            user=self.user,
+            title="Run 100km",
+            target_value=100.0,
+            deadline=date.today() + timedelta(days=30)
+        )
+        self.client.force_login(self.user)
+    
+    def test_card_shows_new_progress(self):
+        """Test that adding progress is reflected the next time the cards load."""
+        url = reverse('goals_api')
+        self.client.get(url)
+        
+        Progress.objects.create(user=self.user, goal=self.goal, value=25.0)
+        html = self.client.get(url).json()['html']
+        
+        self.assertIn('25% Complete', html)
+    
+    def test_card_shows_edited_title(self):
+        """Test that editing the goal is reflected the next time the cards load."""
+        url = reverse('goals_api')
+        self.client.get(url)
+        
+        self.goal.title = "Run 200km"
+        self.goal.save()
+        html = self.client.get(url).json()['html']
+        
+        self.assertIn('Run 200km', html)
+    
+    def test_today_progress_is_prefetched(self):
+        """
+        Test that the cards don't look up today's progress one by one.
+        
+        However many goals there are, today's entries come from a single
+        prefetch query.
+        """
+        for i in range(3):
+            goal = Goal.objects.create(user=self.user, title=f"Goal {i}", target_value=10.0)
+            Progress.objects.create(user=self.user, goal=goal, value=1.0)
+        url = reverse('goals_api')
+        
+        # session, user, goals, today's progress
+        with self.assertNumQueries(4):
+            html = self.client.get(url).json()['html']
+        
+        self.assertIn('completed today!', html)
+
+
+class ViewQueryCountTest(TestCase):
+    """
+    Lock in the number of database queries for the busiest pages.
+    
+    Why count queries?
+    ------------------
+    An N+1 regression (one extra query per goal) doesn't break any other
+    test, it just makes pages slower. Several goals are created so a query
+    inside a loop would push the count up and fail these tests.
+    
+    The counts include the session and user lookups made for a
+    logged-in request.
+    """
+    
+    def setUp(self):
+        """Set up a user with several goals, each with progress and a like."""
+        from social.models import Like
+        
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.category = Category.objects.create(cat="Fitness", order=1)
+        self.unit = Unit.objects.create(name="km", order=1)
+        self.category.units.add(self.unit)
+        
+        self.goals = []
+        for i in range(3):
+            goal = Goal.objects.create(
+                user=self.user,
+                title=f"Goal {i}",
+                category=self.category,
+                unit=self.unit,
+                target_value=100.0,
+                deadline=date.today() + timedelta(days=30)
+            )
+            Progress.objects.create(user=self.user, goal=goal, value=5.0)
+            Like.objects.create(user=self.user, goal=goal)
+            self.goals.append(goal)
+        
+        # Measure the steady state, with the category list already cached
+        cache.clear()
+        category_list()
+        
+        self.client.force_login(self.user)
+    
+    def test_dashboard_query_count(self):
+        """Test the dashboard query count."""
+        with self.assertNumQueries(3):
+            self.client.get(reverse('dashboard', kwargs={'username': 'testuser'}))
+    
+    def test_feed_query_count(self):
+        """Test the public feed query count."""
+        with self.assertNumQueries(3):
+            self.client.get(reverse('feed'))
+    
+    def test_goal_detail_query_count(self):
+        """Test the goal detail query count."""
+        with self.assertNumQueries(4):
+            self.client.get(reverse('goal_detail', kwargs={'goal_id': self.goals[0].id}))
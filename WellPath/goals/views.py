@@ -1,11 +1,20 @@
-from django.http import JsonResponse
+from datetime import date
+
+import orjson
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils.http import url_has_allowed_host_and_scheme
+from django.utils.functional import SimpleLazyObject
+from django.utils.timezone import now
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.forms import AuthenticationForm
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.template.loader import render_to_string
-from taxonomy.models import Category, Unit
+from taxonomy.services import category_list
 
 from .models import Goal, Progress, ProgressPhoto
 from .forms import CustomUserCreationForm, GoalForm, GoalEditForm
@@ -16,24 +25,83 @@ from . import services
 
 # Context processor
 def categories_context(request):
-    return {'categories': Category.objects.all()}
+    # Lazy: fragments like the goal cards never read it
+    return {'categories': SimpleLazyObject(category_list)}
 
 
 # =============================================================================
 # PUBLIC VIEWS
 # =============================================================================
 
+FEED_PAGE_SIZE = 25
+FEED_MAX_PAGE = 10_000
+HISTORY_PAGE_SIZE = 50
+
+
+@transaction.non_atomic_requests
 def index(request):
     return render(request, "goals/index.html")
 
 
+class FeedPage:
+    """
+    One page of the feed. Infinite scroll only needs to know whether
+    another page exists, so unlike Paginator it never COUNTs the goals.
+    """
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+
+def _feed_page(page_number):
+    """Load one page of the public feed."""
+    try:
+        number = max(int(page_number), 1)
+    except (TypeError, ValueError):
+        number = 1
+    # Past this the OFFSET can overflow the database's integer type
+    if number > FEED_MAX_PAGE:
+        return FeedPage([], number, has_next=False)
+    start = (number - 1) * FEED_PAGE_SIZE
+    
+    # Fetch one extra row to learn whether there is a next page
+    active_goals = services.goal_public_queryset(status_filter="active")
+    goals = list(active_goals[start:start + FEED_PAGE_SIZE + 1])
+    return FeedPage(goals[:FEED_PAGE_SIZE], number, has_next=len(goals) > FEED_PAGE_SIZE)
+
+
+@transaction.non_atomic_requests
 def feed(request):
     """Public feed showing active goals from all users."""
-    active_goals = services.goal_list_public(status_filter="active")
+    page_obj = _feed_page(request.GET.get("page"))
+    
+    # Infinite scroll asks for the next page with htmx; send only the cards
+    if request.headers.get("HX-Request"):
+        return render(request, "goals/_feed_card.html", {
+            "goals": page_obj,
+            "page_obj": page_obj,
+        })
     
     return render(request, "goals/feed.html", {
-        "goals": active_goals,
-        "categories": Category.objects.all(),
+        "goals": page_obj,
+        "page_obj": page_obj,
     })
 
 
@@ -43,25 +111,19 @@ def feed(request):
 
 def login_view(request):
     if request.method == "POST":
-        username = request.POST.get("username")
-        password = request.POST.get("password")
-
-        if not username or not password:
-            messages.error(request, "Username and password are required.")
-            return redirect("login")
-
-        user = authenticate(request, username=username, password=password)
-        if user is not None:
-            login(request, user)
+        # Validate in the same request and render errors inline,
+        # instead of redirecting back to the login page.
+        form = AuthenticationForm(request, data=request.POST)
+        if form.is_valid():
+            login(request, form.get_user())
             next_url = request.GET.get("next")
             if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
                 return redirect(next_url)
             return redirect("index")
-        else:
-            messages.error(request, "Invalid username or password.")
-            return redirect("login")
-    
-    return render(request, "goals/login.html")
+    else:
+        form = AuthenticationForm(request)
+
+    return render(request, "goals/login.html", {"form": form})
 
 
 def logout_view(request):
@@ -94,6 +156,7 @@ def register_view(request):
 # GOAL MANAGEMENT
 # =============================================================================
 
+@transaction.non_atomic_requests
 def goals_view(request):
     return render(request, "goals/goals.html")
 
@@ -120,11 +183,8 @@ def create_goal(request):
 @login_required
 def edit_goal(request, goal_id):
     """Edit an existing goal."""
-    goal = get_object_or_404(Goal, id=goal_id)
-    
-    if goal.user != request.user:
-        messages.error(request, "You do not have permission to edit this goal.")
-        return redirect("goal_detail", goal_id=goal.id)
+    # Ownership is part of the lookup: other users' goals are a 404
+    goal = get_object_or_404(Goal, id=goal_id, user=request.user)
     
     if request.method == "POST":
         form = GoalEditForm(request.POST, instance=goal)
@@ -145,16 +205,7 @@ def edit_goal(request, goal_id):
 def delete_goal(request, goal_id):
     """Delete a goal (owner only)."""
     if request.method == "POST":
-        try:
-            goal = Goal.objects.get(id=goal_id)
-        except Goal.DoesNotExist:
-            messages.error(request, "Goal not found.")
-            return redirect("dashboard", username=request.user.username)
-        
-        if goal.user != request.user:
-            messages.error(request, "You do not have permission to delete this goal.")
-            return redirect("dashboard", username=request.user.username)
-        
+        goal = get_object_or_404(Goal, id=goal_id, user=request.user)
         goal.delete()
         messages.success(request, "Goal deleted successfully!")
         return redirect("dashboard", username=request.user.username)
@@ -166,63 +217,153 @@ def delete_goal(request, goal_id):
 # PROGRESS TRACKING
 # =============================================================================
 
+def _wants_json(request):
+    """True when an AJAX client explicitly asked for a JSON response."""
+    return "application/json" in request.headers.get("Accept", "")
+
+
+def _goal_id(request):
+    """The goal_id form field as a positive int, or None."""
+    try:
+        goal_id = int(request.POST.get("goal_id", ""))
+    except (TypeError, ValueError):
+        return None
+    return goal_id if goal_id > 0 else None
+
+
+def _invalid_goal_response(request):
+    if _wants_json(request):
+        return JsonResponse({"ok": False, "error": "Invalid goal."}, status=400)
+    return HttpResponseBadRequest("Invalid goal.")
+
+
 @login_required
 def add_progress(request):
-    """Add or update progress for a goal."""   
+    """Add or update progress for a goal."""
     if request.method == "POST":
-        goal_id = request.POST.get("goal_id")
+        goal_id = _goal_id(request)
+        if goal_id is None:
+            return _invalid_goal_response(request)
         try:
             value = float(request.POST.get("progress"))
             if value < 0:
                 raise ValueError("Negative value")
         except (ValueError, TypeError):
+            if _wants_json(request):
+                return JsonResponse({"ok": False, "error": "Invalid progress value."}, status=400)
             messages.error(request, "Invaid pregress value.")
             return redirect("goal_detail", goal_id=goal_id)
-            
-        goal = Goal.objects.get(id=goal_id)
-        
+
+        goal = get_object_or_404(Goal, id=goal_id, user=request.user)
+
         # Get uploaded images
         images = request.FILES.getlist("images")
-        
-        # Use service to create/update progress
-        progress, created = services.progress_create_or_update(
-            user=request.user,
-            goal=goal,
-            value=value,
-            images=images
-        )
-        
+
+        # Saving the progress and flagging completion commit together
+        with transaction.atomic():
+            # Use service to create/update progress
+            services.progress_create_or_update(
+                user=request.user,
+                goal=goal,
+                value=value,
+                images=images
+            )
+
+            # Sum once and reuse it for the completion check and the response
+            current_total = goal.get_current_value()
+
+            # Check if goal was just completed
+            was_completed = services.progress_check_goal_completion(goal, current_value=current_total)
+
+        # AJAX clients render their own notification, so skip the
+        # messages framework (and its session write) for them.
+        if _wants_json(request):
+            return JsonResponse({
+                "ok": True,
+                "current_total": current_total,
+                "completed": goal.finished_at is not None,
+                "just_completed": was_completed,
+            })
+
         messages.success(request, "Progress saved successfully!")
-        
-        # Check if goal was just completed
-        was_completed = services.progress_check_goal_completion(goal)
         if was_completed:
             messages.success(request, "Congratulations! You've achieved your goal.")
-        
+
         return redirect("goal_detail", goal_id=goal_id)
     
     return redirect("dashboard", username=request.user.username)
 
 
+@login_required
+def add_progress_batch(request):
+    """Add or update progress for several days of a goal at once."""
+    if request.method != "POST":
+        return redirect("dashboard", username=request.user.username)
+
+    goal_id = _goal_id(request)
+    if goal_id is None:
+        return _invalid_goal_response(request)
+    goal = get_object_or_404(Goal, id=goal_id, user=request.user)
+
+    # Parallel "date" and "progress" fields, one pair per day
+    dates = request.POST.getlist("date")
+    values = request.POST.getlist("progress")
+    try:
+        if not dates or len(dates) != len(values):
+            raise ValueError("Mismatched entries")
+        entries = []
+        for raw_date, raw_value in zip(dates, values):
+            entry_date = date.fromisoformat(raw_date)
+            value = float(raw_value)
+            if value < 0 or entry_date > now().date():
+                raise ValueError("Invalid entry")
+            entries.append((entry_date, value))
+    except (ValueError, TypeError):
+        if _wants_json(request):
+            return JsonResponse({"ok": False, "error": "Invalid progress entries."}, status=400)
+        messages.error(request, "Invalid progress entries.")
+        return redirect("goal_detail", goal_id=goal.id)
+
+    with transaction.atomic():
+        services.progress_bulk_upsert(user=request.user, goal=goal, entries=entries)
+        current_total = goal.get_current_value()
+        was_completed = services.progress_check_goal_completion(goal, current_value=current_total)
+
+    if _wants_json(request):
+        return JsonResponse({
+            "ok": True,
+            "saved": len(entries),
+            "current_total": current_total,
+            "completed": goal.finished_at is not None,
+            "just_completed": was_completed,
+        })
+
+    messages.success(request, "Progress saved successfully!")
+    if was_completed:
+        messages.success(request, "Congratulations! You've achieved your goal.")
+
+    return redirect("goal_detail", goal_id=goal.id)
+
+
 # =============================================================================
 # DASHBOARD & DETAIL VIEWS
 # =============================================================================
 
+@transaction.non_atomic_requests
 @login_required
 def dashboard(request, username):
     """User's personal dashboard."""
-    goals = services.goal_list_for_user(user=request.user)
-    categories = Category.objects.all()
+    # Goal cards are loaded per tab through goals_api, so the page itself
+    # only needs the category summary.
     category_stats = services.dashboard_get_category_stats(user=request.user)
     
     return render(request, "goals/dashboard.html", {
         "user": request.user,
-        "goals": goals,
-        "categories": categories,
         "category_stats": category_stats,
     })
 
 
+@transaction.non_atomic_requests
 def goal_detail(request, goal_id):
     """Detailed view of a single goal with progress history and charts."""
     goal = get_object_or_404(
@@ -234,7 +375,7 @@ def goal_detail(request, goal_id):
     today_progress = goal.has_today_progress(request.user)
     
     # Get chart data from service
-    chart_data = services.goal_get_chart_data(goal)
+    chart_data = services.goal_get_chart_data_cached(goal)
     
     return render(request, "goals/goal_detail.html", {
         "goal": goal,
@@ -246,14 +387,18 @@ def goal_detail(request, goal_id):
     })
 
 
+@transaction.non_atomic_requests
 def progress_history(request, goal_id):
     """View progress history for a goal."""
-    goal = get_object_or_404(Goal, id=goal_id)
-    progress_history = Progress.objects.filter(goal=goal).order_by("-date")
+    goal = get_object_or_404(Goal.objects.select_related('unit'), id=goal_id)
+    # The history table only shows the date and value of each entry
+    progress_history = Progress.objects.filter(goal=goal).only('id', 'date', 'value').order_by("-date")
+    page_obj = Paginator(progress_history, HISTORY_PAGE_SIZE).get_page(request.GET.get("page"))
     
     return render(request, "goals/history.html", {
         "goal": goal,
-        "progress_history": progress_history
+        "progress_history": page_obj,
+        "page_obj": page_obj,
     })
 
 
@@ -261,29 +406,32 @@ def progress_history(request, goal_id):
 # AJAX/API ENDPOINTS
 # =============================================================================
 
-def load_units(request):
-    """AJAX endpoint to load units for a category."""
-    category_id = request.GET.get("category_id")
-    units = Unit.objects.filter(categories__id=category_id).order_by("order")
-    return JsonResponse(list(units.values("id", "name")), safe=False)
-
-
+@transaction.non_atomic_requests
 @login_required
 def goals_api(request):
     """API endpoint to filter goals by status (for dynamic UI)."""
     filter_type = request.GET.get("status", "active")
     
-    filtered_goals = services.goal_list_for_user(
-    user=request.user,
-    status_filter=filter_type
-)    # Attach today_progress to each goal so the template can use it
+    # Fetch today's entries for all the goals in one extra query, instead
+    # of one has_today_progress() query per card
+    today_progress = Prefetch(
+        "progresses",
+        queryset=Progress.objects.filter(user=request.user, date=now().date()),
+        to_attr="today_progresses",
+    )
+    filtered_goals = services.goal_queryset_for_user(
+        user=request.user,
+        status_filter=filter_type
+    ).prefetch_related(today_progress)
+    
+    # Attach today_progress to each goal so the template can use it
     for goal in filtered_goals:
-        goal.today_progress = goal.has_today_progress(request.user)
-        
-  
+        goal.today_progress = goal.today_progresses[0] if goal.today_progresses else None
+    
     html = render_to_string("goals/_goal_card.html", {
         "goals": filtered_goals,
         "show_progress_form": True
     }, request=request)
     
-    return JsonResponse({"html": html})
\ No newline at end of file
+    # orjson serializes the large card HTML string much faster than json
+    return HttpResponse(orjson.dumps({"html": html}), content_type="application/json")
\ No newline at end of file
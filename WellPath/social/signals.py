@@ -0,0 +1,28 @@
+"""
+Keep Goal.likes_count in sync with the Like rows, however they are
+created or deleted (the like view, the admin, cascades).
+"""
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from goals.models import Goal
+
+from .models import Like
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        Goal.objects.filter(pk=instance.goal_id).update(likes_count=F('likes_count') + 1)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, **kwargs):
+    # Likes made with bulk_create() skip post_save, so the count can lag
+    # behind; never let it go below zero
+    Goal.objects.filter(pk=instance.goal_id).update(
+        likes_count=Greatest(F('likes_count') - 1, 0)
+    )
@@ -14,7 +14,9 @@ Social features are important for user engagement. Testing ensures that
 users can like goals correctly and that the system prevents duplicate likes.
 """
 
-from django.test import TestCase, Client
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from .models import Like
@@ -36,7 +38,8 @@ class LikeModelTest(TestCase):
     liking a post on social media - one user can like one goal only once.
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Set up test data.
         
@@ -46,27 +49,27 @@ class LikeModelTest(TestCase):
         - A test goal (to be liked)
         """
         # Create test users
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
-        self.goal_owner = User.objects.create_user(
+        cls.goal_owner = User.objects.create_user(
             username='goalowner',
             password='testpass123'
         )
         
         # Create test category and unit
-        self.category = Category.objects.create(cat="Fitness", order=1)
-        self.unit = Unit.objects.create(name="km", order=1)
-        self.category.units.add(self.unit)
+        cls.category = Category.objects.create(cat="Fitness", order=1)
+        cls.unit = Unit.objects.create(name="km", order=1)
+        cls.category.units.add(cls.unit)
         
         # Create a test goal
-        self.goal = Goal.objects.create(
-            user=self.goal_owner,
+        cls.goal = Goal.objects.create(
+            user=cls.goal_owner,
             title="Run 100km",
             description="Complete 100km of running",
-            category=self.category,
-            unit=self.unit,
+            category=cls.category,
+            unit=cls.unit,
             target_value=100.0,
             is_public=True
         )
@@ -88,18 +91,6 @@ class LikeModelTest(TestCase):
         # The like should have a created_at timestamp
         self.assertIsNotNone(like.created_at)
     
-    def test_like_string_representation(self):
-        """
-        Test the __str__() method.
-        
-        The string representation helps with debugging and in the Django admin.
-        """
-        like = Like.objects.create(user=self.user, goal=self.goal)
-        
-        # Should show "username liked goal_title"
-        expected = f"{self.user.username} liked {self.goal.title}"
-        self.assertEqual(str(like), expected)
-    
     def test_like_unique_constraint(self):
         """
         Test that a user cannot like the same goal twice.
@@ -123,13 +114,17 @@ class LikeModelTest(TestCase):
         
         This uses the reverse relationship from Goal to Like.
         """
-        # Create multiple likes from different users
-        user2 = User.objects.create_user(username='user2', password='pass')
-        user3 = User.objects.create_user(username='user3', password='pass')
-        
-        Like.objects.create(user=self.user, goal=self.goal)
-        Like.objects.create(user=user2, goal=self.goal)
-        Like.objects.create(user=user3, goal=self.goal)
+        # Create multiple likes from different users. bulk_create inserts
+        # each batch in one query; nobody logs in, so no passwords needed.
+        user2, user3 = User.objects.bulk_create([
+            User(username='user2'),
+            User(username='user3'),
+        ])
+        
+        Like.objects.bulk_create([
+            Like(user=user, goal=self.goal)
+            for user in (self.user, user2, user3)
+        ])
         
         # The goal should have 3 likes
         self.assertEqual(self.goal.likes.count(), 3)
@@ -150,6 +145,32 @@ class LikeModelTest(TestCase):
         self.assertTrue(self.goal.is_liked_by(self.user))
 
 
+class LikeStringTest(SimpleTestCase):
+    """
+    Test the Like model's string representation.
+    
+    Why SimpleTestCase?
+    -------------------
+    __str__() only reads attributes, so unsaved instances are enough.
+    SimpleTestCase doesn't set up the database at all, which keeps these
+    tests fast.
+    """
+    
+    def test_like_string_representation(self):
+        """
+        Test the __str__() method.
+        
+        The string representation helps with debugging and in the Django admin.
+        """
+        user = User(username='testuser')
+        goal = Goal(user=user, title="Run 100km", target_value=100.0)
+        like = Like(user=user, goal=goal)
+        
+        # Should show "username liked goal_title"
+        expected = f"{user.username} liked {goal.title}"
+        self.assertEqual(str(like), expected)
+
+
 class LikeViewTest(TestCase):
     """
     Test the like/unlike view.
@@ -162,38 +183,39 @@ class LikeViewTest(TestCase):
     3. Returns JSON with the updated like count
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Set up test data for view tests.
         """
         # Create test users
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
-        self.goal_owner = User.objects.create_user(
+        cls.goal_owner = User.objects.create_user(
             username='goalowner',
             password='testpass123'
         )
         
-        # Create test client
-        self.client = Client()
-        
         # Create test category and unit
-        self.category = Category.objects.create(cat="Fitness", order=1)
-        self.unit = Unit.objects.create(name="km", order=1)
-        self.category.units.add(self.unit)
+        cls.category = Category.objects.create(cat="Fitness", order=1)
+        cls.unit = Unit.objects.create(name="km", order=1)
+        cls.category.units.add(cls.unit)
         
         # Create a test goal
-        self.goal = Goal.objects.create(
-            user=self.goal_owner,
+        cls.goal = Goal.objects.create(
+            user=cls.goal_owner,
             title="Run 100km",
             description="Complete 100km of running",
-            category=self.category,
-            unit=self.unit,
+            category=cls.category,
+            unit=cls.unit,
             target_value=100.0,
             is_public=True
         )
+        
+        # Resolve the endpoint once instead of in every test
+        cls.like_url = reverse('like_goal', kwargs={'goal_id': cls.goal.id})
     
     def test_like_requires_login(self):
         """
@@ -202,9 +224,7 @@ class LikeViewTest(TestCase):
         Anonymous users should not be able to like goals.
         """
         # Try to like without logging in
-        response = self.client.post(
-            reverse('like_goal', kwargs={'goal_id': self.goal.id})
-        )
+        response = self.client.post(self.like_url)
         
         # Should redirect to login (status code 302)
         self.assertEqual(response.status_code, 302)
@@ -220,12 +240,10 @@ class LikeViewTest(TestCase):
         The @require_POST decorator enforces this.
         """
         # Log in
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Try to use GET instead of POST
-        response = self.client.get(
-            reverse('like_goal', kwargs={'goal_id': self.goal.id})
-        )
+        response = self.client.get(self.like_url)
         
         # Should return 405 Method Not Allowed
         self.assertEqual(response.status_code, 405)
@@ -235,12 +253,10 @@ class LikeViewTest(TestCase):
         Test that a user can successfully like a goal.
         """
         # Log in
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Like the goal
-        response = self.client.post(
-            reverse('like_goal', kwargs={'goal_id': self.goal.id})
-        )
+        response = self.client.post(self.like_url)
         
         # Should return success (status code 200)
         self.assertEqual(response.status_code, 200)
@@ -257,20 +273,31 @@ class LikeViewTest(TestCase):
         # Verify the like was created in the database
         self.assertTrue(Like.objects.filter(user=self.user, goal=self.goal).exists())
     
+    def test_like_response_keys(self):
+        """
+        Test the exact keys of the like endpoint's JSON response.
+        
+        social-feed.js reads `liked` and `likes_count` to update the button,
+        so the payload shape is a contract with the front end.
+        """
+        self.client.force_login(self.user)
+        
+        data = self.client.post(self.like_url).json()
+        
+        self.assertEqual(set(data), {'status', 'liked', 'likes_count'})
+    
     def test_unlike_goal_success(self):
         """
         Test that a user can unlike a goal they've previously liked.
         """
         # Log in
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        # First, create a like
-        Like.objects.create(user=self.user, goal=self.goal)
+        # First, like the goal through the view so its likes_count is 1
+        self.client.post(self.like_url)
         
         # Now unlike the goal (by posting again)
-        response = self.client.post(
-            reverse('like_goal', kwargs={'goal_id': self.goal.id})
-        )
+        response = self.client.post(self.like_url)
         
         # Parse JSON response
         data = response.json()
@@ -284,12 +311,81 @@ class LikeViewTest(TestCase):
         # Verify the like was deleted from the database
         self.assertFalse(Like.objects.filter(user=self.user, goal=self.goal).exists())
     
+    def test_unlike_query_count(self):
+        """
+        Test the number of queries an unlike takes.
+        
+        The like count is updated by a signal and read back once for the
+        response.
+        """
+        self.client.force_login(self.user)
+        self.client.post(self.like_url)
+        
+        # session, user, goal, like SELECT + DELETE, counter UPDATE,
+        # the savepoint pair around the atomic block and the count read
+        with self.assertNumQueries(9):
+            response = self.client.post(self.like_url)
+        
+        self.assertFalse(response.json()['liked'])
+        self.assertEqual(response.json()['likes_count'], 0)
+    
+    def test_concurrent_like_is_not_an_error(self):
+        """
+        Test a double-click where the other request created the like first.
+        
+        Our DELETE finds nothing, so we try to create the like and hit the
+        unique constraint. The view must answer "liked" instead of failing.
+        """
+        self.client.force_login(self.user)
+        self.client.post(self.like_url)
+        
+        # Pretend the like wasn't there yet when we tried to delete it
+        with mock.patch.object(Like.objects, 'filter', return_value=Like.objects.none()):
+            response = self.client.post(self.like_url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['liked'])
+        self.assertEqual(response.json()['likes_count'], 1)
+        self.assertEqual(Like.objects.filter(goal=self.goal).count(), 1)
+    
+    def test_unlike_with_out_of_sync_count(self):
+        """
+        Test that unliking works even when likes_count is already 0.
+        
+        bulk_create() skips the post_save signal, so this like was never
+        counted. Removing it must not push the count below zero.
+        """
+        Like.objects.bulk_create([Like(user=self.user, goal=self.goal)])
+        self.client.force_login(self.user)
+        
+        response = self.client.post(self.like_url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['likes_count'], 0)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.likes_count, 0)
+    
+    def test_likes_count_follows_deleted_likes(self):
+        """
+        Test that likes_count drops when likes are deleted outside the view.
+        
+        Deleting a user removes their likes by cascade; the post_delete
+        signal keeps the goal's stored count correct.
+        """
+        self.client.force_login(self.user)
+        self.client.post(self.like_url)
+        
+        User.objects.filter(pk=self.user.pk).delete()
+        
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.likes_count, 0)
+    
     def test_like_nonexistent_goal(self):
         """
         Test that liking a non-existent goal returns a 404 error.
         """
         # Log in
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Try to like a goal that doesn't exist
         response = self.client.post(
@@ -307,18 +403,14 @@ class LikeViewTest(TestCase):
         user2 = User.objects.create_user(username='user2', password='pass')
         
         # First user likes the goal
-        self.client.login(username='testuser', password='testpass123')
-        response1 = self.client.post(
-            reverse('like_goal', kwargs={'goal_id': self.goal.id})
-        )
+        self.client.force_login(self.user)
+        response1 = self.client.post(self.like_url)
         data1 = response1.json()
         self.assertEqual(data1['likes_count'], 1)
         
         # Second user likes the same goal
-        self.client.login(username='user2', password='pass')
-        response2 = self.client.post(
-            reverse('like_goal', kwargs={'goal_id': self.goal.id})
-        )
+        self.client.force_login(user2)
+        response2 = self.client.post(self.like_url)
         data2 = response2.json()
         
         # Like count should now be 2
@@ -1,5 +1,6 @@
 from django.shortcuts import render
 from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
@@ -11,21 +12,28 @@ from goals.models import Goal  # Import from goals.models directly
 def like_goal(request, goal_id):
     goal = get_object_or_404(Goal, pk=goal_id)
     
-    # check if user already liked
-    like_obj = Like.objects.filter(user=request.user, goal=goal).first()
+    # The toggle and the counter update (see signals.py) commit together
+    with transaction.atomic():
+        # Try to unlike first: a DELETE that reports whether a like existed
+        deleted, _ = Like.objects.filter(user=request.user, goal=goal).delete()
+        
+        if deleted:
+            # unlike
+            liked = False
+        else:
+            # like; a double-click can race us to it, which still ends liked
+            try:
+                with transaction.atomic():
+                    Like.objects.create(user=request.user, goal=goal)
+            except IntegrityError:
+                pass
+            liked = True
     
-    if like_obj:
-        # unlike
-        like_obj.delete()
-        liked = False
-    else:
-        # like
-        Like.objects.create(user=request.user, goal=goal)
-        liked = True
+    # Read the stored count back so likes from others are included
+    likes_count = Goal.objects.values_list('likes_count', flat=True).get(pk=goal.pk)
     
     return JsonResponse({
         'status': 'success',
         'liked': liked,
-        'likes_count': goal.likes.count()
+        'likes_count': likes_count
     })
-
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.14 on 2026-10-15 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxonomy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['order'], name='unit_order_idx'),
+        ),
+    ]
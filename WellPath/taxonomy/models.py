@@ -1,4 +1,6 @@
 from django.db import models
+from django.urls import reverse
+from django.utils.text import slugify
 
 # Create your models here.
 class Category(models.Model):
@@ -11,14 +13,18 @@ class Category(models.Model):
         return self.cat
 
     def save(self, *args, **kwargs):
-        from django.utils.text import slugify
-
         if not self.slug:
             base_slug = slugify(self.cat)
+            # ensure unique slug: fetch the taken ones in one query and
+            # pick the first free suffix locally
+            taken = set(
+                Category.objects.filter(slug__startswith=base_slug)
+                .exclude(id=self.id)
+                .values_list("slug", flat=True)
+            )
             slug = base_slug
             counter = 1
-            # ensure unique slug
-            while Category.objects.filter(slug=slug).exclude(id=self.id).exists():
+            while slug in taken:
                 slug = f"{base_slug}-{counter}"
                 counter += 1
 
@@ -27,7 +33,6 @@ class Category(models.Model):
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
-        from django.urls import reverse
         return reverse("category", kwargs={"category_slug": self.slug})
 
     class Meta:
@@ -44,5 +49,9 @@ class Unit(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            # load_units sorts a category's units by order
+            models.Index(fields=['order'], name='unit_order_idx'),
+        ]
         verbose_name_plural = "Units"
         app_label = "taxonomy"
\ No newline at end of file
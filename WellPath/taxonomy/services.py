@@ -0,0 +1,72 @@
+"""
+Business logic for taxonomy app.
+Following HackSoft Django Style Guide principles.
+"""
+
+import hashlib
+
+import orjson
+from django.core.cache import cache
+from typing import Iterable, List
+
+from .models import Category, Unit
+
+
+# Unit lists rarely change; signals clear them when they do
+UNITS_CACHE_TIMEOUT = 60 * 60
+
+CATEGORIES_CACHE_KEY = "taxonomy:categories"
+CATEGORIES_CACHE_TIMEOUT = 60 * 60
+
+
+def category_list() -> List[Category]:
+    """
+    All categories in display order, for the navigation on every page.
+    Cached so rendering a page doesn't need a query for them.
+    """
+    categories = cache.get(CATEGORIES_CACHE_KEY)
+    if categories is None:
+        categories = list(Category.objects.all())
+        cache.set(CATEGORIES_CACHE_KEY, categories, CATEGORIES_CACHE_TIMEOUT)
+    return categories
+
+
+def category_cache_invalidate() -> None:
+    """Drop the cached category list."""
+    cache.delete(CATEGORIES_CACHE_KEY)
+
+
+def _units_cache_key(category_id: int) -> str:
+    return f"taxonomy:units:{category_id}"
+
+
+def unit_list_json(*, category_id) -> bytes:
+    """
+    The units of a category as a ready-to-send JSON body.
+    Cached per category as bytes, so a cache hit needs neither the M2M
+    join nor serialization.
+    """
+    category_id = int(category_id)
+    key = _units_cache_key(category_id)
+    
+    body = cache.get(key)
+    if body is None:
+        body = orjson.dumps([
+            {"id": id, "name": name}
+            for id, name in Unit.objects.filter(
+                categories__id=category_id
+            ).order_by("order").values_list("id", "name")
+        ])
+        cache.set(key, body, UNITS_CACHE_TIMEOUT)
+    
+    return body
+
+
+def unit_cache_invalidate(*, category_ids: Iterable[int]) -> None:
+    """Drop the cached unit lists for the given categories."""
+    cache.delete_many([_units_cache_key(category_id) for category_id in category_ids])
+
+
+def unit_list_etag(*, category_id) -> str:
+    """ETag for a category's unit list, so browsers can revalidate with a 304."""
+    return hashlib.md5(unit_list_json(category_id=category_id)).hexdigest()
@@ -0,0 +1,46 @@
+"""
+Keep the cached category list and unit lists (see services) in sync
+with Category and Unit changes.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Category, Unit
+from .services import category_cache_invalidate, unit_cache_invalidate
+
+
+@receiver(post_save, sender=Unit)
+@receiver(pre_delete, sender=Unit)
+def unit_changed(sender, instance, **kwargs):
+    # pre_delete: the category links still exist at this point
+    unit_cache_invalidate(category_ids=instance.categories.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, **kwargs):
+    category_cache_invalidate()
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    category_cache_invalidate()
+    unit_cache_invalidate(category_ids=[instance.pk])
+
+
+@receiver(m2m_changed, sender=Category.units.through)
+def category_units_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    
+    if not reverse:
+        # category.units.add/remove/clear
+        category_ids = [instance.pk]
+    elif pk_set is not None:
+        # unit.categories.add/remove
+        category_ids = pk_set
+    else:
+        # unit.categories.clear - read the links before they are removed
+        category_ids = instance.categories.values_list("id", flat=True)
+    
+    unit_cache_invalidate(category_ids=category_ids)
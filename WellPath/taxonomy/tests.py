@@ -17,11 +17,19 @@ before they reach production. It also makes it easier to make changes
 in the future without breaking existing functionality.
 """
 
-from django.test import TestCase, Client
+import os
+import runpy
+import sys
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from .models import Category, Unit
-from goals.models import Goal
+from goals.models import Goal, Progress
+from WellPath import settings as project_settings
 
 # Get the User model (could be custom or default Django User)
 User = get_user_model()
@@ -37,15 +45,18 @@ class CategoryModelTest(TestCase):
     Each category can have multiple units associated with it.
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Set up test data.
         
-        setUp() runs before each test method. It's used to create
-        data that multiple tests need. This keeps tests DRY (Don't Repeat Yourself).
+        setUpTestData() runs once for the whole class, and every test gets
+        the data back as it was, because each test runs in a transaction
+        that is rolled back. That is much faster than setUp(), which would
+        create the data again before every test method.
         """
         # Create a test category
-        self.category = Category.objects.create(
+        cls.category = Category.objects.create(
             cat="Fitness",
             order=1
         )
@@ -61,6 +72,24 @@ class CategoryModelTest(TestCase):
         self.assertEqual(self.category.cat, "Fitness")
         self.assertEqual(self.category.order, 1)
     
+    def test_category_list_cache_invalidated(self):
+        """
+        Test that the cached category list is refreshed on changes.
+        
+        Every page shows the categories in its navigation, so the list
+        is cached. Saving or deleting a category must clear it.
+        """
+        from .services import category_list
+        
+        cache.clear()
+        self.assertEqual([c.cat for c in category_list()], ["Fitness"])
+        
+        Category.objects.create(cat="Nutrition", order=2)
+        self.assertEqual([c.cat for c in category_list()], ["Fitness", "Nutrition"])
+        
+        self.category.delete()
+        self.assertEqual([c.cat for c in category_list()], ["Nutrition"])
+    
     def test_category_slug_generation(self):
         """
         Test that slugs are automatically generated from category names.
@@ -90,14 +119,21 @@ class CategoryModelTest(TestCase):
         self.assertEqual(self.category.slug, "fitness")
         self.assertEqual(category2.slug, "wellness")
     
-    def test_category_string_representation(self):
+    def test_category_slug_collision_suffix(self):
         """
-        Test the __str__() method.
+        Test that names which slugify to a taken slug get a numbered suffix.
         
-        The __str__() method determines how a model instance is displayed
-        as a string (e.g., in the Django admin or when printing).
+        "Fitness!" and "Fitness?" both slugify to "fitness", which is
+        already used. The taken slugs are looked up in a single query,
+        however long the chain of suffixes is.
         """
-        self.assertEqual(str(self.category), "Fitness")
+        Category.objects.create(cat="Fitness!", order=2)
+        
+        # One SELECT for the taken slugs, one INSERT
+        with self.assertNumQueries(2):
+            category = Category.objects.create(cat="Fitness?", order=3)
+        
+        self.assertEqual(category.slug, "fitness-2")
     
     def test_category_ordering(self):
         """
@@ -105,9 +141,12 @@ class CategoryModelTest(TestCase):
         
         This ensures categories appear in a specific order in lists.
         """
-        # Create categories with different order values
-        cat1 = Category.objects.create(cat="Nutrition", order=3)
-        cat2 = Category.objects.create(cat="Wellness", order=2)
+        # Create categories with different order values. bulk_create skips
+        # save(), so the slugs are given explicitly.
+        Category.objects.bulk_create([
+            Category(cat="Nutrition", slug="nutrition", order=3),
+            Category(cat="Wellness", slug="wellness", order=2),
+        ])
         
         # Get all categories - they should be ordered by the 'order' field
         categories = list(Category.objects.all())
@@ -129,8 +168,12 @@ class CategoryModelTest(TestCase):
         unit1 = Unit.objects.create(name="km", order=1)
         unit2 = Unit.objects.create(name="reps", order=2)
         
-        # Add units to the category
-        self.category.units.add(unit1, unit2)
+        # Add units to the category: one INSERT into the through table
+        CategoryUnit = Category.units.through
+        CategoryUnit.objects.bulk_create([
+            CategoryUnit(category=self.category, unit=unit)
+            for unit in (unit1, unit2)
+        ], ignore_conflicts=True)
         
         # The category should have 2 units
         self.assertEqual(self.category.units.count(), 2)
@@ -158,21 +201,16 @@ class UnitModelTest(TestCase):
         self.assertEqual(unit.name, "km")
         self.assertEqual(unit.order, 1)
     
-    def test_unit_string_representation(self):
-        """
-        Test the __str__() method returns the unit name.
-        """
-        unit = Unit.objects.create(name="kg", order=1)
-        self.assertEqual(str(unit), "kg")
-    
     def test_unit_ordering(self):
         """
         Test that units are ordered by their 'order' field.
         """
         # Create units with different orders
-        unit1 = Unit.objects.create(name="km", order=2)
-        unit2 = Unit.objects.create(name="kg", order=1)
-        unit3 = Unit.objects.create(name="reps", order=3)
+        Unit.objects.bulk_create([
+            Unit(name="km", order=2),
+            Unit(name="kg", order=1),
+            Unit(name="reps", order=3),
+        ])
         
         # Get all units - should be ordered by 'order' field
         units = list(Unit.objects.all())
@@ -182,6 +220,35 @@ class UnitModelTest(TestCase):
         self.assertEqual(units[2].name, "reps")  # order=3
 
 
+class TaxonomyStringTest(SimpleTestCase):
+    """
+    Test the string representation of categories and units.
+    
+    Why SimpleTestCase?
+    -------------------
+    __str__() only reads attributes, so unsaved instances are enough.
+    SimpleTestCase doesn't set up the database at all, which keeps these
+    tests fast.
+    """
+    
+    def test_category_string_representation(self):
+        """
+        Test the __str__() method.
+        
+        The __str__() method determines how a model instance is displayed
+        as a string (e.g., in the Django admin or when printing).
+        """
+        category = Category(cat="Fitness", order=1)
+        self.assertEqual(str(category), "Fitness")
+    
+    def test_unit_string_representation(self):
+        """
+        Test the __str__() method returns the unit name.
+        """
+        unit = Unit(name="kg", order=1)
+        self.assertEqual(str(unit), "kg")
+
+
 class TaxonomyViewsTest(TestCase):
     """
     Test the views in the taxonomy app.
@@ -197,45 +264,55 @@ class TaxonomyViewsTest(TestCase):
     the correct data is passed to templates and that permissions work correctly.
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Set up test data for view tests.
         
         We need:
         - A test user (for authentication)
-        - A test client (to simulate HTTP requests)
         - Test categories and units
         - Test goals
         """
         # Create a test user
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
         
-        # Create a test client (used to make requests)
-        self.client = Client()
-        
         # Create test categories and units
-        self.fitness_category = Category.objects.create(cat="Fitness", order=1)
-        self.nutrition_category = Category.objects.create(cat="Nutrition", order=2)
+        cls.fitness_category = Category.objects.create(cat="Fitness", order=1)
+        cls.nutrition_category = Category.objects.create(cat="Nutrition", order=2)
         
-        self.km_unit = Unit.objects.create(name="km", order=1)
-        self.kg_unit = Unit.objects.create(name="kg", order=2)
+        cls.km_unit = Unit.objects.create(name="km", order=1)
+        cls.kg_unit = Unit.objects.create(name="kg", order=2)
         
-        # Associate units with categories
-        self.fitness_category.units.add(self.km_unit)
-        self.nutrition_category.units.add(self.kg_unit)
+        # Associate units with categories in a single INSERT
+        CategoryUnit = Category.units.through
+        CategoryUnit.objects.bulk_create([
+            CategoryUnit(category=cls.fitness_category, unit=cls.km_unit),
+            CategoryUnit(category=cls.nutrition_category, unit=cls.kg_unit),
+        ], ignore_conflicts=True)
         
         # Create a test goal in the fitness category
-        self.goal = Goal.objects.create(
-            user=self.user,
+        cls.goal = Goal.objects.create(
+            user=cls.user,
             title="Run 100km",
             description="Complete 100km of running",
-            category=self.fitness_category,
-            unit=self.km_unit,
+            category=cls.fitness_category,
+            unit=cls.km_unit,
             target_value=100.0
         )
+        
+        # Resolve the category page URL once instead of in every test
+        cls.category_url = reverse('category', kwargs={'category_slug': cls.fitness_category.slug})
+    
+    def setUp(self):
+        """
+        Reset per-test state.
+        """
+        # Unit lists are cached per category; start every test empty
+        cache.clear()
     
     def test_category_view_requires_login(self):
         """
@@ -247,9 +324,7 @@ class TaxonomyViewsTest(TestCase):
         access this view. If not logged in, users should be redirected to login.
         """
         # Try to access the category view without logging in
-        response = self.client.get(
-            reverse('category', kwargs={'category_slug': self.fitness_category.slug})
-        )
+        response = self.client.get(self.category_url)
         
         # Should redirect to login page (status code 302)
         self.assertEqual(response.status_code, 302)
@@ -261,12 +336,10 @@ class TaxonomyViewsTest(TestCase):
         Test that logged-in users can access the category view.
         """
         # Log in the test user
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Access the category view
-        response = self.client.get(
-            reverse('category', kwargs={'category_slug': self.fitness_category.slug})
-        )
+        response = self.client.get(self.category_url)
         
         # Should return success (status code 200)
         self.assertEqual(response.status_code, 200)
@@ -275,12 +348,99 @@ class TaxonomyViewsTest(TestCase):
         # The category should be in the context
         self.assertEqual(response.context['category'], self.fitness_category)
     
+    def test_category_view_uses_cached_categories(self):
+        """
+        Test that finding the page's category doesn't query the database.
+        
+        The category is looked up in the cached category list; an unknown
+        slug is still a 404. The only category query left is the one for
+        the nav badge counts.
+        """
+        self.client.force_login(self.user)
+        self.client.get(self.category_url)  # warm the cache
+        
+        # session, user, goals, nav counts
+        with self.assertNumQueries(4):
+            response = self.client.get(self.category_url)
+        self.assertEqual(response.status_code, 200)
+        
+        response = self.client.get(reverse('category', kwargs={'category_slug': 'missing'}))
+        self.assertEqual(response.status_code, 404)
+    
+    def test_category_view_finds_category_missing_from_cache(self):
+        """
+        Test that a category created after the list was cached still works.
+        
+        The cache is per worker process, so the worker that created the
+        category may not be the one serving the page. bulk_create() skips
+        the signal that clears the cached list, just like a write on
+        another worker.
+        """
+        self.client.force_login(self.user)
+        self.client.get(self.category_url)  # cache the category list
+        
+        Category.objects.bulk_create([Category(cat="Sleep", slug="sleep", order=3)])
+        
+        response = self.client.get(reverse('category', kwargs={'category_slug': 'sleep'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['category'].slug, 'sleep')
+    
+    def test_category_nav_counts_active_goals(self):
+        """
+        Test the active-goal counts shown next to each category in the nav.
+        
+        Only the logged-in user's active goals are counted, grouped by
+        category in the database.
+        """
+        self.client.force_login(self.user)
+        other_user = User.objects.create_user(username='otheruser', password='testpass123')
+        Goal.objects.create(
+            user=other_user,
+            title="Someone else's run",
+            category=self.fitness_category,
+            target_value=10.0
+        )
+        
+        response = self.client.get(self.category_url)
+        
+        counts = {c.cat: c.active_goals_count for c in response.context['categories']}
+        self.assertEqual(counts, {"Fitness": 1, "Nutrition": 0})
+    
+    def test_category_nav_count_matches_goal_list(self):
+        """
+        Test that the nav badge and the goal list agree on "active".
+        
+        Overdue and completed goals are left out of both, even though
+        they have no finished_at.
+        """
+        self.client.force_login(self.user)
+        Goal.objects.create(
+            user=self.user,
+            title="Overdue run",
+            category=self.fitness_category,
+            target_value=10.0,
+            deadline=date.today() - timedelta(days=1)
+        )
+        done_goal = Goal.objects.create(
+            user=self.user,
+            title="Done run",
+            category=self.fitness_category,
+            target_value=5.0
+        )
+        Progress.objects.create(user=self.user, goal=done_goal, value=5.0)
+        
+        response = self.client.get(self.category_url)
+        
+        badge = {c.cat: c.active_goals_count for c in response.context['categories']}["Fitness"]
+        self.assertEqual(badge, 1)
+        self.assertEqual(badge, len(response.context['goals']))
+    
     def test_category_view_filters_goals(self):
         """
         Test that the category view only shows goals for that category.
         """
         # Log in
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create a goal in a different category
         other_goal = Goal.objects.create(
@@ -293,9 +453,7 @@ class TaxonomyViewsTest(TestCase):
         )
         
         # Access the fitness category view
-        response = self.client.get(
-            reverse('category', kwargs={'category_slug': self.fitness_category.slug})
-        )
+        response = self.client.get(self.category_url)
         
         # The fitness goal should be in the goals list
         goals = response.context['goals']
@@ -305,6 +463,29 @@ class TaxonomyViewsTest(TestCase):
         # The nutrition goal should NOT be in the list
         self.assertNotIn(other_goal.id, goal_ids)
     
+    def test_category_view_hides_completed_goals(self):
+        """
+        Test that the category view only lists active goals.
+        
+        The status is computed and filtered in the database, so a goal
+        that reached its target never reaches the template.
+        """
+        self.client.force_login(self.user)
+        
+        done_goal = Goal.objects.create(
+            user=self.user,
+            title="Run 5km",
+            category=self.fitness_category,
+            unit=self.km_unit,
+            target_value=5.0
+        )
+        Progress.objects.create(user=self.user, goal=done_goal, value=5.0)
+        
+        response = self.client.get(self.category_url)
+        
+        goal_ids = [g.id for g in response.context['goals']]
+        self.assertEqual(goal_ids, [self.goal.id])
+    
     def test_load_units_ajax_endpoint(self):
         """
         Test the AJAX endpoint that loads units for a category.
@@ -331,6 +512,43 @@ class TaxonomyViewsTest(TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['name'], 'km')
     
+    def test_load_units_cache_invalidated(self):
+        """
+        Test that the cached unit list is refreshed when units change.
+        
+        The first request caches the list; adding a unit to the category
+        must clear it so the next request sees the new unit.
+        """
+        url = reverse('load_units')
+        self.client.get(url, {'category_id': self.fitness_category.id})
+        
+        self.fitness_category.units.add(self.kg_unit)
+        data = self.client.get(url, {'category_id': self.fitness_category.id}).json()
+        self.assertEqual([u['name'] for u in data], ['km', 'kg'])
+        
+        self.km_unit.name = 'miles'
+        self.km_unit.save()
+        data = self.client.get(url, {'category_id': self.fitness_category.id}).json()
+        self.assertEqual(data[0]['name'], 'miles')
+    
+    def test_load_units_not_modified(self):
+        """
+        Test that a browser holding the current list gets a 304.
+        
+        The response carries an ETag. Sending it back in If-None-Match
+        means "I already have this", so no body needs to be sent.
+        """
+        url = reverse('load_units')
+        response = self.client.get(url, {'category_id': self.fitness_category.id})
+        self.assertIn('max-age=300', response['Cache-Control'])
+        
+        response = self.client.get(
+            url,
+            {'category_id': self.fitness_category.id},
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+    
     def test_load_units_without_category(self):
         """
         Test the load_units endpoint when no category is provided.
@@ -356,3 +574,86 @@ class TaxonomyViewsTest(TestCase):
         
         data = response.json()
         self.assertEqual(len(data), 0)
+    
+    def test_load_units_caches_empty_lists(self):
+        """
+        Test that a category without units is cached like any other.
+        
+        The empty JSON list is stored too, so repeated requests for it
+        don't run the join again.
+        """
+        empty_category = Category.objects.create(cat="Sleep", order=3)
+        url = reverse('load_units')
+        self.client.get(url, {'category_id': empty_category.id})
+        
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'category_id': empty_category.id})
+        
+        self.assertEqual(response.json(), [])
+    
+    def test_load_units_with_non_numeric_category(self):
+        """
+        Test the load_units endpoint with a category ID that isn't a number.
+        
+        Such an ID can never match a category, so the view answers with
+        an empty list without querying the database.
+        """
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('load_units'),
+                {'category_id': 'abc'}
+            )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+    
+    def test_load_units_with_unicode_digit_category(self):
+        """
+        Test the load_units endpoint with a non-ASCII digit like '²'.
+        
+        str.isdigit() accepts it but int() does not; the view must treat
+        it as invalid instead of failing with a server error.
+        """
+        response = self.client.get(reverse('load_units'), {'category_id': '²'})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+
+class CacheSettingsTest(SimpleTestCase):
+    """
+    Test which cache backend settings.py picks outside of test runs.
+    
+    The category and unit caches are cleared by signals, so in production
+    every gunicorn worker must share one cache. These tests run the
+    settings file again with a production-like environment and check the
+    CACHES it produces.
+    """
+    
+    def load_settings(self, **environ):
+        with mock.patch.dict(os.environ, environ), \
+                mock.patch.object(sys, 'argv', ['gunicorn']):
+            return runpy.run_path(project_settings.__file__)
+    
+    def test_debug_false_uses_shared_file_cache(self):
+        """
+        Test that DEBUG=false (as set on Render) turns DEBUG off and
+        selects the file-based cache in CACHE_DIR.
+        """
+        config = self.load_settings(DEBUG='false', CACHE_DIR='/tmp/wellpath-test-cache')
+        
+        self.assertFalse(config['DEBUG'])
+        self.assertEqual(
+            config['CACHES']['default']['BACKEND'],
+            'django.core.cache.backends.filebased.FileBasedCache'
+        )
+        self.assertEqual(config['CACHES']['default']['LOCATION'], '/tmp/wellpath-test-cache')
+    
+    def test_debug_true_keeps_default_cache(self):
+        """
+        Test that DEBUG=1 leaves Django's default local-memory cache.
+        """
+        config = self.load_settings(DEBUG='1')
+        
+        self.assertTrue(config['DEBUG'])
+        self.assertNotIn('CACHES', config)
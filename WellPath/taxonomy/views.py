@@ -1,41 +1,81 @@
-from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.shortcuts import render
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
 from django.contrib.auth.decorators import login_required
 
-from .models import Category, Unit
-from goals.models import Goal  
+from .models import Category
+from . import services
+from goals import services as goal_services
+
+
+@transaction.non_atomic_requests
 @login_required
 def category(request, category_slug):
-    category = get_object_or_404(Category, slug=category_slug)
+    # The navigation already keeps every category cached; look it up there
+    # instead of querying the table again
+    category = next(
+        (c for c in services.category_list() if c.slug == category_slug),
+        None
+    )
+    if category is None:
+        # Another worker may have created it after this process cached
+        # the list; check the database before giving up
+        category = Category.objects.filter(slug=category_slug).first()
+    if category is None:
+        raise Http404("No Category matches the given query.")
 
-    # Filter goals for this category
-    goals = Goal.objects.filter(
+    # Active goals for this category, filtered by status in the database.
+    # Only the columns the feed cards render are selected. The template
+    # evaluates the queryset on first use and reuses its result cache.
+    active_goals = goal_services.goal_queryset_for_user(
         user=request.user,
-        category=category  # Add this filter!
-    ).select_related(
-        "category", "unit"
-    ).prefetch_related(
-        "progresses"
+        status_filter="active",
+        category=category,
+    ).only(
+        "id", "title", "description", "target_value", "deadline",
+        "created_at", "likes_count",
+        "user__username", "category__cat", "category__slug", "unit__name",
     )
 
-    # Filter active goals using list comprehension
-    active_goals = [g for g in goals if g.status == 'active']
-
     return render(request, "taxonomy/category.html", {
         "goals": active_goals,
         "category": category,
-        "categories": Category.objects.all(),
+        # The nav badges show this user's active goals per category
+        "categories": goal_services.category_list_with_active_counts(user=request.user),
     })
 
+def _category_id(request):
+    """The category_id query parameter as a positive int, or None."""
+    try:
+        category_id = int(request.GET.get("category_id", ""))
+    except (TypeError, ValueError):
+        return None
+    return category_id if category_id > 0 else None
+
+
+def _load_units_etag(request):
+    category_id = _category_id(request)
+    if category_id is None:
+        return None
+    return services.unit_list_etag(category_id=category_id)
+
+
+# Units change rarely: let browsers reuse the list for a few minutes and
+# then revalidate it with If-None-Match
+@transaction.non_atomic_requests
+@cache_control(max_age=300)
+@etag(_load_units_etag)
 def load_units(request):
     """AJAX view to load units based on selected category."""
-    category_id = request.GET.get("category_id")
+    category_id = _category_id(request)
     
-    if not category_id:
+    # Missing or malformed ids can't match a category: answer without a query
+    if category_id is None:
         return JsonResponse([], safe=False)
     
-    units = Unit.objects.filter(
-        categories__id=category_id
-    ).order_by("order").values("id", "name")
-    
-    return JsonResponse(list(units), safe=False)
\ No newline at end of file
+    return HttpResponse(
+        services.unit_list_json(category_id=category_id),
+        content_type="application/json"
+    )